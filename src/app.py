@@ -3,118 +3,132 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import uvicorn
 
-app = FastAPI()
-
-# In-memory activity database
-activities = {
-   "Chess Club": {
-      "description": "Learn strategies and compete in chess tournaments",
-      "schedule": "Fridays, 3:30 PM - 5:00 PM",
-      "max_participants": 12,
-      "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-   },
-   "Programming Class": {
-      "description": "Learn programming fundamentals and build software projects",
-      "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-      "max_participants": 20,
-      "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-   },
-   "Gym Class": {
-      "description": "Physical education and sports activities",
-      "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-      "max_participants": 30,
-      "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-   },
-   "Basketball Team": {
-      "description": "Competitive basketball training and games",
-      "schedule": "Tuesdays and Thursdays, 4:00 PM - 6:00 PM",
-      "max_participants": 15,
-      "participants": []
-   },
-   "Swimming Club": {
-      "description": "Swimming training and water sports",
-      "schedule": "Mondays and Wednesdays, 3:30 PM - 5:00 PM",
-      "max_participants": 20,
-      "participants": []
-   },
-   "Art Studio": {
-      "description": "Express creativity through painting and drawing",
-      "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-      "max_participants": 15,
-      "participants": []
-   },
-   "Drama Club": {
-      "description": "Theater arts and performance training",
-      "schedule": "Tuesdays, 4:00 PM - 6:00 PM",
-      "max_participants": 25,
-      "participants": []
-   },
-   "Debate Team": {
-      "description": "Learn public speaking and argumentation skills",
-      "schedule": "Thursdays, 3:30 PM - 5:00 PM",
-      "max_participants": 16,
-      "participants": []
-   },
-   "Science Club": {
-      "description": "Hands-on experiments and scientific exploration",
-      "schedule": "Fridays, 3:30 PM - 5:00 PM",
-      "max_participants": 20,
-      "participants": []
-   }
-}
-
-# Mount static files
-app.mount("/static", StaticFiles(directory="src/static"), name="static")
-
-@app.get("/")
-def read_root():
-    """Serve the main page"""
-    return FileResponse("src/static/index.html")
-
-@app.get("/activities")
-def get_activities():
-    """Get all activities with their details"""
-    return activities
-
-@app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
-    """Sign up a student for an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
-    
-    # Get the activity
-    activity = activities[activity_name]
-    
-    # Validate student is not already signed up
-    if email in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student is already signed up")
-    
-    # Check if activity is full
-    if len(activity["participants"]) >= activity["max_participants"]:
-        raise HTTPException(status_code=400, detail="Activity is full")
-    
-    # Add student
-    activity["participants"].append(email)
-    return {"message": f"Signed up {email} for {activity_name}"}
-
-@app.post("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
-    """Unregister a student from an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
-    
-    # Get the activity
-    activity = activities[activity_name]
-    
-    # Validate student is registered
-    if email not in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student is not registered for this activity")
-    
-    # Remove student
-    activity["participants"].remove(email)
-    return {"message": f"Unregistered {email} from {activity_name}"}
+def create_activities():
+    """Build a fresh copy of the in-memory activity database"""
+    return {
+        "Chess Club": {
+            "description": "Learn strategies and compete in chess tournaments",
+            "schedule": "Fridays, 3:30 PM - 5:00 PM",
+            "max_participants": 12,
+            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+        },
+        "Programming Class": {
+            "description": "Learn programming fundamentals and build software projects",
+            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+            "max_participants": 20,
+            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+        },
+        "Gym Class": {
+            "description": "Physical education and sports activities",
+            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+            "max_participants": 30,
+            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+        },
+        "Basketball Team": {
+            "description": "Competitive basketball training and games",
+            "schedule": "Tuesdays and Thursdays, 4:00 PM - 6:00 PM",
+            "max_participants": 15,
+            "participants": []
+        },
+        "Swimming Club": {
+            "description": "Swimming training and water sports",
+            "schedule": "Mondays and Wednesdays, 3:30 PM - 5:00 PM",
+            "max_participants": 20,
+            "participants": []
+        },
+        "Art Studio": {
+            "description": "Express creativity through painting and drawing",
+            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+            "max_participants": 15,
+            "participants": []
+        },
+        "Drama Club": {
+            "description": "Theater arts and performance training",
+            "schedule": "Tuesdays, 4:00 PM - 6:00 PM",
+            "max_participants": 25,
+            "participants": []
+        },
+        "Debate Team": {
+            "description": "Learn public speaking and argumentation skills",
+            "schedule": "Thursdays, 3:30 PM - 5:00 PM",
+            "max_participants": 16,
+            "participants": []
+        },
+        "Science Club": {
+            "description": "Hands-on experiments and scientific exploration",
+            "schedule": "Fridays, 3:30 PM - 5:00 PM",
+            "max_participants": 20,
+            "participants": []
+        }
+    }
+
+
+def create_app() -> FastAPI:
+    """Create the FastAPI app with its own activity database"""
+    app = FastAPI()
+
+    # In-memory activity database
+    activities = create_activities()
+    app.state.activities = activities
+
+    # Mount static files
+    app.mount("/static", StaticFiles(directory="src/static"), name="static")
+
+    @app.get("/")
+    def read_root():
+        """Serve the main page"""
+        return FileResponse("src/static/index.html")
+
+    @app.get("/activities")
+    def get_activities():
+        """Get all activities with their details"""
+        return activities
+
+    @app.post("/activities/{activity_name}/signup")
+    def signup_for_activity(activity_name: str, email: str):
+        """Sign up a student for an activity"""
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
+
+        # Get the activity
+        activity = activities[activity_name]
+
+        # Validate student is not already signed up
+        if email in activity["participants"]:
+            raise HTTPException(status_code=400, detail="Student is already signed up")
+
+        # Check if activity is full
+        if len(activity["participants"]) >= activity["max_participants"]:
+            raise HTTPException(status_code=400, detail="Activity is full")
+
+        # Add student
+        activity["participants"].append(email)
+        return {"message": f"Signed up {email} for {activity_name}"}
+
+    @app.post("/activities/{activity_name}/unregister")
+    def unregister_from_activity(activity_name: str, email: str):
+        """Unregister a student from an activity"""
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
+
+        # Get the activity
+        activity = activities[activity_name]
+
+        # Validate student is registered
+        if email not in activity["participants"]:
+            raise HTTPException(status_code=400, detail="Student is not registered for this activity")
+
+        # Remove student
+        activity["participants"].remove(email)
+        return {"message": f"Unregistered {email} from {activity_name}"}
+
+    return app
+
+
+app = create_app()
+activities = app.state.activities
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
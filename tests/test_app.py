@@ -1,30 +1,98 @@
 """
 Comprehensive tests for the Mergington High School Activities API
 """
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from src.app import app, activities
-import copy
+
+BASKETBALL_SIGNUP = "/activities/Basketball%20Team/signup"
+BASKETBALL_UNREGISTER = "/activities/Basketball%20Team/unregister"
+CHESS_SIGNUP = "/activities/Chess%20Club/signup"
+CHESS_UNREGISTER = "/activities/Chess%20Club/unregister"
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Create a FastAPI app with its own activities for this test session"""
+    from src.app import create_app
+    return create_app()
 
 
 @pytest.fixture
-def client():
+def activities(app):
+    """The in-memory activities backing the test app"""
+    return app.state.activities
+
+
+@pytest.fixture(scope="session")
+def client(app):
     """Create a test client for the FastAPI app"""
     return TestClient(app)
 
 
+@pytest.fixture(scope="session")
+def baseline_activities_response(client):
+    """Fetch GET /activities once per session for read-only tests"""
+    return client.get("/activities")
+
+
+@pytest_asyncio.fixture
+async def aclient(app):
+    """Create an async client that calls the ASGI app in-process"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def _signup(client, activity, email):
+    """Sign a student up for an activity, passing the email as a query param"""
+    return client.post(f"/activities/{activity}/signup", params={"email": email})
+
+
+@pytest.fixture
+def seeded(request, activities):
+    """Fill an activity directly, leaving the given number of free slots"""
+    activity, free_slots = request.param
+    participants = activities[activity]["participants"]
+    fill_to = activities[activity]["max_participants"] - free_slots
+    participants.extend(
+        f"seed{i}@mergington.edu" for i in range(fill_to - len(participants))
+    )
+    return activity
+
+
+def _snapshot(acts):
+    """Copy the activities dict; only the participants lists are mutable"""
+    return {
+        name: {
+            "description": a["description"],
+            "schedule": a["schedule"],
+            "max_participants": a["max_participants"],
+            "participants": a["participants"].copy(),
+        }
+        for name, a in acts.items()
+    }
+
+
+@pytest.fixture(scope="session")
+def _pristine_activities(app):
+    """Snapshot the original activities once per test session"""
+    return _snapshot(app.state.activities)
+
+
 @pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities data before each test"""
-    global activities
-    # Store original state
-    original_activities = copy.deepcopy(activities)
-    
+def reset_activities(request, activities, _pristine_activities):
+    """Reset activities data after each test marked as mutating it"""
     yield
     
+    # Read-only tests leave the data untouched, so skip the restore
+    if request.node.get_closest_marker("mutates") is None:
+        return
+    
     # Restore original state after test
     activities.clear()
-    activities.update(original_activities)
+    activities.update(_snapshot(_pristine_activities))
 
 
 class TestRootEndpoint:
@@ -40,9 +108,9 @@ class TestRootEndpoint:
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_activities_success(self, client):
-        """Test retrieving all activities"""
-        response = client.get("/activities")
+    def test_get_activities_contract(self, baseline_activities_response):
+        """Test retrieving all activities, their structure and contents"""
+        response = baseline_activities_response
         assert response.status_code == 200
         data = response.json()
         
@@ -52,39 +120,28 @@ class TestGetActivities:
         
         # Verify activity structure
         for activity_name, activity_data in data.items():
-            assert "description" in activity_data
-            assert "schedule" in activity_data
-            assert "max_participants" in activity_data
-            assert "participants" in activity_data
-            assert isinstance(activity_data["participants"], list)
-    
-    def test_get_activities_contains_expected_activities(self, client):
-        """Test that response contains expected activities"""
-        response = client.get("/activities")
-        data = response.json()
+            for field in ("description", "schedule", "max_participants", "participants"):
+                assert field in activity_data, f"{activity_name} missing {field}"
+            assert isinstance(activity_data["participants"], list), activity_name
         
         # Check for some expected activities
-        assert "Chess Club" in data
-        assert "Programming Class" in data
-        assert "Basketball Team" in data
-    
-    def test_get_activities_participant_data(self, client):
-        """Test that participant data is included"""
-        response = client.get("/activities")
-        data = response.json()
+        for activity in ("Chess Club", "Programming Class", "Basketball Team"):
+            assert activity in data, f"{activity} missing from response"
         
         # Chess Club should have participants
-        assert len(data["Chess Club"]["participants"]) > 0
-        assert "michael@mergington.edu" in data["Chess Club"]["participants"]
+        chess_participants = data["Chess Club"]["participants"]
+        assert len(chess_participants) > 0, "Chess Club has no participants"
+        assert "michael@mergington.edu" in chess_participants
 
 
 class TestSignupForActivity:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_success(self, client):
+    @pytest.mark.mutates
+    async def test_signup_success(self, aclient, activities):
         """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Basketball Team/signup?email=test@mergington.edu"
+        response = await aclient.post(
+            BASKETBALL_SIGNUP, params={"email": "test@mergington.edu"}
         )
         assert response.status_code == 200
         data = response.json()
@@ -93,13 +150,11 @@ class TestSignupForActivity:
         assert "Basketball Team" in data["message"]
         
         # Verify student was added to activity
-        verify_response = client.get("/activities")
-        activities_data = verify_response.json()
-        assert "test@mergington.edu" in activities_data["Basketball Team"]["participants"]
+        assert "test@mergington.edu" in activities["Basketball Team"]["participants"]
     
-    def test_signup_activity_not_found(self, client):
+    async def test_signup_activity_not_found(self, aclient):
         """Test signup for non-existent activity"""
-        response = client.post(
+        response = await aclient.post(
             "/activities/Nonexistent Activity/signup?email=test@mergington.edu"
         )
         assert response.status_code == 404
@@ -107,51 +162,40 @@ class TestSignupForActivity:
         assert "detail" in data
         assert "not found" in data["detail"].lower()
     
-    def test_signup_duplicate_registration(self, client):
+    @pytest.mark.mutates
+    async def test_signup_duplicate_registration(self, aclient):
         """Test that duplicate signup is prevented"""
         email = "duplicate@mergington.edu"
         activity = "Basketball Team"
         
         # First signup should succeed
-        response1 = client.post(f"/activities/{activity}/signup?email={email}")
+        response1 = await _signup(aclient, activity, email)
         assert response1.status_code == 200
         
         # Second signup should fail
-        response2 = client.post(f"/activities/{activity}/signup?email={email}")
+        response2 = await _signup(aclient, activity, email)
         assert response2.status_code == 400
         data = response2.json()
         assert "detail" in data
         assert "already signed up" in data["detail"].lower()
     
-    def test_signup_activity_full(self, client):
+    @pytest.mark.mutates
+    @pytest.mark.parametrize("seeded", [("Basketball Team", 0)], indirect=True)
+    async def test_signup_activity_full(self, aclient, seeded):
         """Test that signup fails when activity is full"""
-        activity = "Basketball Team"
-        
-        # Get max participants for Basketball Team
-        activities_response = client.get("/activities")
-        max_participants = activities_response.json()[activity]["max_participants"]
-        
-        # Fill up the activity
-        for i in range(max_participants):
-            response = client.post(
-                f"/activities/{activity}/signup?email=student{i}@mergington.edu"
-            )
-            assert response.status_code == 200
-        
         # Try to add one more student - should fail
-        response = client.post(
-            f"/activities/{activity}/signup?email=overflow@mergington.edu"
-        )
+        response = await _signup(aclient, seeded, "overflow@mergington.edu")
         assert response.status_code == 400
         data = response.json()
         assert "detail" in data
         assert "full" in data["detail"].lower()
     
-    def test_signup_with_special_characters_in_activity_name(self, client):
+    @pytest.mark.mutates
+    async def test_signup_with_special_characters_in_activity_name(self, aclient):
         """Test signup with URL-encoded activity name"""
         # "Chess Club" with URL encoding
-        response = client.post(
-            "/activities/Chess%20Club/signup?email=newplayer@mergington.edu"
+        response = await aclient.post(
+            CHESS_SIGNUP, params={"email": "newplayer@mergington.edu"}
         )
         assert response.status_code == 200
 
@@ -159,30 +203,28 @@ class TestSignupForActivity:
 class TestUnregisterFromActivity:
     """Tests for POST /activities/{activity_name}/unregister endpoint"""
     
-    def test_unregister_success(self, client):
+    @pytest.mark.mutates
+    async def test_unregister_success(self, aclient, activities):
         """Test successful unregistration from an activity"""
         email = "michael@mergington.edu"
         activity = "Chess Club"
         
         # Verify student is initially registered
-        activities_response = client.get("/activities")
-        assert email in activities_response.json()[activity]["participants"]
+        assert email in activities[activity]["participants"]
         
         # Unregister student
-        response = client.post(f"/activities/{activity}/unregister?email={email}")
+        response = await aclient.post(CHESS_UNREGISTER, params={"email": email})
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
         assert email in data["message"]
         
         # Verify student was removed
-        verify_response = client.get("/activities")
-        activities_data = verify_response.json()
-        assert email not in activities_data[activity]["participants"]
+        assert email not in activities[activity]["participants"]
     
-    def test_unregister_activity_not_found(self, client):
+    async def test_unregister_activity_not_found(self, aclient):
         """Test unregister from non-existent activity"""
-        response = client.post(
+        response = await aclient.post(
             "/activities/Nonexistent Activity/unregister?email=test@mergington.edu"
         )
         assert response.status_code == 404
@@ -190,132 +232,158 @@ class TestUnregisterFromActivity:
         assert "detail" in data
         assert "not found" in data["detail"].lower()
     
-    def test_unregister_student_not_registered(self, client):
+    async def test_unregister_student_not_registered(self, aclient):
         """Test unregister when student is not registered"""
-        response = client.post(
-            "/activities/Basketball Team/unregister?email=notregistered@mergington.edu"
+        response = await aclient.post(
+            BASKETBALL_UNREGISTER, params={"email": "notregistered@mergington.edu"}
         )
         assert response.status_code == 400
         data = response.json()
         assert "detail" in data
         assert "not registered" in data["detail"].lower()
     
-    def test_signup_and_unregister_workflow(self, client):
+    @pytest.mark.mutates
+    async def test_signup_and_unregister_workflow(self, aclient, activities):
         """Test complete workflow: signup then unregister"""
         email = "workflow@mergington.edu"
         activity = "Swimming Club"
         
         # Signup
-        signup_response = client.post(f"/activities/{activity}/signup?email={email}")
+        signup_response = await _signup(aclient, activity, email)
         assert signup_response.status_code == 200
         
         # Verify signup
-        verify_response = client.get("/activities")
-        assert email in verify_response.json()[activity]["participants"]
+        assert email in activities[activity]["participants"]
         
         # Unregister
-        unregister_response = client.post(f"/activities/{activity}/unregister?email={email}")
+        unregister_response = await aclient.post(f"/activities/{activity}/unregister?email={email}")
         assert unregister_response.status_code == 200
         
         # Verify unregistration
-        final_response = client.get("/activities")
-        assert email not in final_response.json()[activity]["participants"]
+        assert email not in activities[activity]["participants"]
 
 
+@pytest.mark.mutates
 class TestDataIntegrity:
     """Tests for data integrity and edge cases"""
     
-    def test_multiple_students_signup(self, client):
+    async def test_multiple_students_signup(self, aclient, activities):
         """Test multiple students can sign up for same activity"""
         activity = "Drama Club"
         emails = [f"student{i}@mergington.edu" for i in range(5)]
         
         for email in emails:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
+            response = await _signup(aclient, activity, email)
             assert response.status_code == 200
         
         # Verify all students are registered
-        activities_response = client.get("/activities")
-        participants = activities_response.json()[activity]["participants"]
-        for email in emails:
-            assert email in participants
+        missing = set(emails) - set(activities[activity]["participants"])
+        assert not missing, missing
     
-    def test_student_signup_multiple_activities(self, client):
+    async def test_student_signup_multiple_activities(self, aclient, activities):
         """Test that a student can sign up for multiple activities"""
         email = "multi@mergington.edu"
         activities_list = ["Basketball Team", "Swimming Club", "Art Studio"]
         
         for activity in activities_list:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
+            response = await _signup(aclient, activity, email)
             assert response.status_code == 200
         
         # Verify student is in all activities
-        all_activities = client.get("/activities").json()
-        for activity in activities_list:
-            assert email in all_activities[activity]["participants"]
+        missing = {
+            activity for activity in activities_list
+            if email not in activities[activity]["participants"]
+        }
+        assert not missing, missing
     
-    def test_activity_capacity_tracking(self, client):
+    @pytest.mark.parametrize("seeded", [("Art Studio", 1)], indirect=True)
+    async def test_activity_capacity_tracking(self, aclient, activities, seeded):
         """Test that activity capacity is correctly tracked"""
-        activity = "Art Studio"
-        
-        # Get initial state
-        initial_response = client.get("/activities")
-        initial_count = len(initial_response.json()[activity]["participants"])
-        max_participants = initial_response.json()[activity]["max_participants"]
-        
-        # Add students up to capacity
-        slots_available = max_participants - initial_count
-        for i in range(slots_available):
-            response = client.post(
-                f"/activities/{activity}/signup?email=artist{i}@mergington.edu"
-            )
-            assert response.status_code == 200
+        # Sign up the student taking the last free slot
+        response = await _signup(aclient, seeded, "lastartist@mergington.edu")
+        assert response.status_code == 200
         
         # Verify activity is now full
-        final_response = client.get("/activities")
-        final_count = len(final_response.json()[activity]["participants"])
-        assert final_count == max_participants
+        final_count = len(activities[seeded]["participants"])
+        assert final_count == activities[seeded]["max_participants"]
 
 
+@pytest.mark.mutates
 class TestEdgeCases:
     """Tests for edge cases and error handling"""
     
-    def test_email_format_flexibility(self, client):
+    @pytest.mark.parametrize("email", [
+        "simple@mergington.edu",
+        "first.last@mergington.edu",
+        "student+tag@mergington.edu",
+        "123numeric@mergington.edu"
+    ])
+    async def test_email_format_flexibility(self, aclient, email):
         """Test that different email formats are accepted"""
-        emails = [
-            "simple@mergington.edu",
-            "first.last@mergington.edu",
-            "student+tag@mergington.edu",
-            "123numeric@mergington.edu"
-        ]
-        
         activity = "Science Club"
-        for email in emails:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
-            assert response.status_code == 200
+        response = await _signup(aclient, activity, email)
+        assert response.status_code == 200
     
-    def test_activity_name_with_spaces(self, client):
+    @pytest.mark.parametrize(
+        "activity", ["Chess Club", "Programming Class", "Gym Class"]
+    )
+    async def test_activity_name_with_spaces(self, aclient, activity):
         """Test activities with spaces in names"""
-        activities_with_spaces = ["Chess Club", "Programming Class", "Gym Class"]
-        
-        for activity in activities_with_spaces:
-            response = client.post(
-                f"/activities/{activity}/signup?email=test@mergington.edu"
-            )
-            # Should work (either 200 or 400 for duplicate)
-            assert response.status_code in [200, 400]
+        response = await aclient.post(
+            f"/activities/{activity}/signup?email=test@mergington.edu"
+        )
+        # Should work (either 200 or 400 for duplicate)
+        assert response.status_code in [200, 400]
     
-    def test_concurrent_signups(self, client):
+    async def test_concurrent_signups(self, aclient):
         """Test behavior with concurrent signup attempts"""
         activity = "Debate Team"
         emails = [f"concurrent{i}@mergington.edu" for i in range(10)]
         
         # Simulate concurrent signups
         responses = [
-            client.post(f"/activities/{activity}/signup?email={email}")
+            await _signup(aclient, activity, email)
             for email in emails
         ]
         
         # All should succeed (activity has capacity)
         for response in responses:
             assert response.status_code == 200
+
+
+class TestBenchmarks:
+    """Benchmarks for the hot API paths, measured with pytest-codspeed"""
+    
+    def test_get_activities_benchmark(self, client, benchmark):
+        """Benchmark retrieving all activities"""
+        response = benchmark(client.get, "/activities")
+        assert response.status_code == 200
+    
+    @pytest.mark.mutates
+    def test_signup_benchmark(self, client, benchmark, activities):
+        """Benchmark signing up a student, removing them after each round"""
+        email = "bench@mergington.edu"
+        participants = activities["Basketball Team"]["participants"]
+        
+        response = benchmark.pedantic(
+            client.post,
+            args=(BASKETBALL_SIGNUP,),
+            kwargs={"params": {"email": email}},
+            teardown=lambda *args, **kwargs: participants.remove(email),
+        )
+        assert response.status_code == 200
+    
+    @pytest.mark.mutates
+    def test_unregister_benchmark(self, client, benchmark, activities):
+        """Benchmark unregistering a student, re-adding them before each round"""
+        email = "michael@mergington.edu"
+        participants = activities["Chess Club"]["participants"]
+        participants.remove(email)
+        
+        response = benchmark.pedantic(
+            client.post,
+            args=(CHESS_UNREGISTER,),
+            kwargs={"params": {"email": email}},
+            setup=lambda *args, **kwargs: participants.append(email),
+        )
+        assert response.status_code == 200